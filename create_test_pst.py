@@ -7,9 +7,94 @@ This script creates sample email data in various formats for testing purposes.
 
 import os
 import sys
-import argparse
+import shutil
 from datetime import datetime, timedelta
 import random
+from concurrent.futures import ProcessPoolExecutor
+
+# Mock PST payloads are written in chunks of this size to bound memory use
+MOCK_WRITE_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Body shared by all generated EML files; only the placeholders vary per email
+EML_BODY_TEMPLATE = """Hello {recipient_name},
+
+This is a test email message #{number} regarding: {subject}
+
+Key points:
+- Item 1: Lorem ipsum dolor sit amet
+- Item 2: Consectetur adipiscing elit
+- Item 3: Sed do eiusmod tempor incididunt
+
+Please review and let me know if you have any questions.
+
+Best regards,
+{sender_name}
+"""
+
+# Complete EML file; every generated email shares this single-part layout
+EML_TEMPLATE = (
+    "From: {sender}\n"
+    "To: {recipient}\n"
+    "Subject: {subject}\n"
+    "Date: {date}\n"
+    "MIME-Version: 1.0\n"
+    "Content-Type: text/plain; charset=\"utf-8\"\n"
+    "Content-Transfer-Encoding: 8bit\n"
+    "\n"
+    "{body}"
+)
+
+# One mbox entry: "From " separator line, headers, body and a trailing blank line
+MBOX_MESSAGE_TEMPLATE = (
+    "From {sender} {timestamp}\n"
+    "Content-Type: text/plain; charset=\"us-ascii\"\n"
+    "MIME-Version: 1.0\n"
+    "Content-Transfer-Encoding: 7bit\n"
+    "Subject: {subject}\n"
+    "From: {sender}\n"
+    "To: recipient@example.com\n"
+    "\n"
+    "This is test email #{number} with some sample content.\n"
+    "\n"
+)
+
+def _write_one_eml(eml_args):
+    """
+    Write a single test EML file. Runs in a worker process.
+    
+    Args:
+        eml_args: Tuple of (index, output_dir, sender, recipient, subject, email_date)
+        
+    Returns:
+        Name of the file that was written
+    """
+    i, output_dir, (sender_name, sender_email), (recipient_name, recipient_email), subject, email_date = eml_args
+    
+    # Body
+    body = EML_BODY_TEMPLATE.format(
+        recipient_name=recipient_name,
+        number=i + 1,
+        subject=subject,
+        sender_name=sender_name
+    )
+    
+    eml = EML_TEMPLATE.format(
+        sender=f"{sender_name} <{sender_email}>",
+        recipient=f"{recipient_name} <{recipient_email}>",
+        subject=subject,
+        date=email_date.strftime("%a, %d %b %Y %H:%M:%S %z"),
+        body=body
+    )
+    
+    # Save to file
+    filename = f"test_email_{i+1:03d}.eml"
+    filepath = os.path.join(output_dir, filename)
+    
+    with open(filepath, 'wb') as f:
+        f.write(eml.encode('utf-8'))
+    
+    return filename
+
 
 def create_test_eml_files(output_dir, num_emails=10):
     """
@@ -19,10 +104,6 @@ def create_test_eml_files(output_dir, num_emails=10):
         output_dir: Directory to save EML files
         num_emails: Number of test emails to create
     """
-    import email
-    from email.mime.text import MIMEText
-    from email.mime.multipart import MIMEMultipart
-    
     os.makedirs(output_dir, exist_ok=True)
     
     subjects = [
@@ -54,52 +135,23 @@ def create_test_eml_files(output_dir, num_emails=10):
     
     print(f"Creating {num_emails} test EML files in {output_dir}...")
     
-    for i in range(num_emails):
-        msg = MIMEMultipart()
-        
-        # Select random sender
-        sender_name, sender_email = random.choice(senders)
-        msg['From'] = f"{sender_name} <{sender_email}>"
-        
-        # Select random recipient
-        recipient_name, recipient_email = random.choice(recipients)
-        msg['To'] = f"{recipient_name} <{recipient_email}>"
-        
-        # Subject
-        subject = subjects[i % len(subjects)]
-        msg['Subject'] = subject
-        
-        # Date (random date in past 6 months)
-        days_ago = random.randint(0, 180)
-        email_date = datetime.now() - timedelta(days=days_ago)
-        msg['Date'] = email_date.strftime("%a, %d %b %Y %H:%M:%S %z")
-        
-        # Body
-        body = f"""Hello {recipient_name},
-
-This is a test email message #{i+1} regarding: {subject}
-
-Key points:
-- Item 1: Lorem ipsum dolor sit amet
-- Item 2: Consectetur adipiscing elit
-- Item 3: Sed do eiusmod tempor incididunt
-
-Please review and let me know if you have any questions.
-
-Best regards,
-{sender_name}
-"""
-        
-        msg.attach(MIMEText(body, 'plain'))
-        
-        # Save to file
-        filename = f"test_email_{i+1:03d}.eml"
-        filepath = os.path.join(output_dir, filename)
-        
-        with open(filepath, 'w') as f:
-            f.write(msg.as_string())
-        
-        print(f"  ✓ Created {filename}")
+    # Random selections are made up front so the workers only format and write
+    sender_sample = random.choices(senders, k=num_emails)
+    recipient_sample = random.choices(recipients, k=num_emails)
+    # Date (random date in past 6 months)
+    days_ago_sample = random.choices(range(181), k=num_emails)
+    
+    now = datetime.now()
+    eml_args = [
+        (i, output_dir, sender, recipient, subjects[i % len(subjects)], now - timedelta(days=days_ago))
+        for i, (sender, recipient, days_ago) in enumerate(zip(sender_sample, recipient_sample, days_ago_sample))
+    ]
+    
+    # Each file is independent, so spread the writes across worker processes
+    chunksize = max(1, num_emails // (4 * (os.cpu_count() or 1)))
+    with ProcessPoolExecutor() as executor:
+        for filename in executor.map(_write_one_eml, eml_args, chunksize=chunksize):
+            print(f"  ✓ Created {filename}")
     
     print(f"\n✅ Successfully created {num_emails} EML files!")
     print(f"\nTo create a PST file from these EMLs:")
@@ -119,10 +171,7 @@ def create_test_mbox(output_file, num_emails=10):
         output_file: Path to save MBOX file
         num_emails: Number of test emails to create
     """
-    import mailbox
-    from email.mime.text import MIMEText
-    
-    mbox = mailbox.mbox(output_file)
+    import time
     
     subjects = [
         "Project Update - Q4 2024",
@@ -134,16 +183,21 @@ def create_test_mbox(output_file, num_emails=10):
     
     print(f"Creating MBOX file with {num_emails} emails: {output_file}")
     
+    # mbox is plain concatenated messages, so build the whole file and write it once
+    timestamp = time.asctime(time.gmtime())
+    entries = []
     for i in range(num_emails):
-        msg = MIMEText(f"This is test email #{i+1} with some sample content.")
-        msg['Subject'] = subjects[i % len(subjects)]
-        msg['From'] = f"sender{i % 5}@example.com"
-        msg['To'] = "recipient@example.com"
-        
-        mbox.add(msg)
+        entries.append(MBOX_MESSAGE_TEMPLATE.format(
+            sender=f"sender{i % 5}@example.com",
+            timestamp=timestamp,
+            subject=subjects[i % len(subjects)],
+            number=i + 1
+        ))
         print(f"  ✓ Added email {i+1}/{num_emails}")
     
-    mbox.close()
+    with open(output_file, 'wb') as f:
+        f.write("".join(entries).encode('ascii'))
+    
     print(f"\n✅ Successfully created MBOX file: {output_file}")
     print("Note: MBOX is not the same as PST, but can be used for email testing")
 
@@ -221,16 +275,29 @@ def create_mock_pst_structure(output_dir, num_files=3, size_mb_per_file=1):
     
     print(f"Creating {num_files} mock PST files in {output_dir}...")
     
+    prototype_path = None
+    size_bytes = size_mb_per_file * 1024 * 1024
+    
+    # One random chunk is generated up front and reused for every write
+    chunk = memoryview(os.urandom(min(MOCK_WRITE_CHUNK_BYTES, size_bytes)))
+    
     for i in range(num_files):
         filename = f"mock_test_{i+1}.pst"
         filepath = os.path.join(output_dir, filename)
         
-        # Create a file with test data (not a real PST, but for testing file discovery)
-        with open(filepath, 'wb') as f:
-            # Write some binary-looking data
-            size_bytes = size_mb_per_file * 1024 * 1024
-            data = bytes(random.randint(0, 255) for _ in range(size_bytes))
-            f.write(data)
+        if prototype_path is None:
+            # Create a file with test data (not a real PST, but for testing file discovery)
+            with open(filepath, 'wb') as f:
+                # Write some binary-looking data
+                remaining = size_bytes
+                while remaining > 0:
+                    chunk_size = min(len(chunk), remaining)
+                    f.write(chunk[:chunk_size])
+                    remaining -= chunk_size
+            prototype_path = filepath
+        else:
+            # Clone the first file; copyfile uses in-kernel copies where available
+            shutil.copyfile(prototype_path, filepath)
         
         actual_size = os.path.getsize(filepath) / (1024 * 1024)
         print(f"  ✓ Created {filename} ({actual_size:.2f} MB)")
@@ -240,7 +307,13 @@ def create_mock_pst_structure(output_dir, num_files=3, size_mb_per_file=1):
     print("   They cannot be parsed by pypff, but can test the parallel processing logic")
 
 
-def main():
+def _build_parser():
+    """
+    Build the command line parser. Kept out of module import so that
+    importing this script for its helper functions stays cheap.
+    """
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Create test PST files or sample email data for testing the PST parser"
     )
@@ -290,15 +363,21 @@ def main():
         help='Show information about how to get sample PST files'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    parser = _build_parser()
     
-    # If no arguments, show help and info
+    # If no arguments, show help and info without parsing
     if len(sys.argv) == 1:
         parser.print_help()
         print("\n")
         download_sample_pst()
         return
     
+    args = parser.parse_args()
+    
     if args.info:
         download_sample_pst()
         return
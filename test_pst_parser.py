@@ -9,8 +9,43 @@ import os
 import sys
 import tempfile
 import shutil
+import hashlib
+import itertools
 from datetime import datetime
 
+# Every capitalization of ".pst", so the suffix check needs no lowercased copy of each name
+_PST_SUFFIXES = tuple({''.join(chars) for chars in itertools.product(*[(ch.lower(), ch.upper()) for ch in '.pst'])})
+
+
+def _scan_pst_files(directory, root=None):
+    """Recursively yield (file_path, file_size_bytes, relative_path) for PST files using os.scandir."""
+    root = directory if root is None else root
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_pst_files(entry.path, root)
+            elif entry.name.endswith(_PST_SUFFIXES):
+                yield entry.path, entry.stat().st_size, os.path.relpath(entry.path, root)
+
+
+def _write_lines(lines):
+    """Write buffered output lines to stdout in a single call."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _generate_message_ids(messages):
+    """Generate message IDs for a batch of (source_file, subject, sender, delivery_time) tuples."""
+    message_ids = []
+    for source_file, subject, sender, delivery_time in messages:
+        id_hasher = hashlib.blake2b(digest_size=16)
+        id_hasher.update(source_file.encode())
+        id_hasher.update(subject.encode())
+        id_hasher.update(sender.encode())
+        id_hasher.update(str(delivery_time).encode())
+        message_ids.append(id_hasher.hexdigest())
+    return message_ids
+
 
 def test_file_discovery():
     """Test the PST file discovery functionality."""
@@ -48,17 +83,10 @@ def test_file_discovery():
         # Test file discovery (import the function)
         try:
             # Simulate the find_pst_files function
-            pst_files = []
-            for root, dirs, files in os.walk(tmpdir):
-                for file in files:
-                    if file.lower().endswith('.pst'):
-                        file_path = os.path.join(root, file)
-                        file_size = os.path.getsize(file_path)
-                        pst_files.append((file_path, file_size))
+            pst_files = list(_scan_pst_files(tmpdir))
             
             print(f"\n✓ Found {len(pst_files)} PST files:")
-            for fp, fs in pst_files:
-                print(f"  - {os.path.relpath(fp, tmpdir)}")
+            _write_lines([f"  - {rel_path}" for _, _, rel_path in pst_files])
             
             assert len(pst_files) == len(test_files), f"Expected {len(test_files)}, found {len(pst_files)}"
             print("\n✅ TEST PASSED: File discovery working correctly")
@@ -85,6 +113,7 @@ def test_parallel_partitioning():
     
     print("Testing partition calculations:")
     all_passed = True
+    log = []
     
     for num_files, num_partitions_input, expected_partitions in test_cases:
         # Simulate the partition calculation logic
@@ -94,11 +123,13 @@ def test_parallel_partitioning():
             calculated = num_partitions_input
         
         status = "✓" if calculated == expected_partitions else "✗"
-        print(f"  {status} {num_files} files, partition={num_partitions_input} -> {calculated} (expected {expected_partitions})")
+        log.append(f"  {status} {num_files} files, partition={num_partitions_input} -> {calculated} (expected {expected_partitions})")
         
         if calculated != expected_partitions:
             all_passed = False
     
+    _write_lines(log)
+    
     if all_passed:
         print("\n✅ TEST PASSED: Partition logic working correctly")
     else:
@@ -122,19 +153,19 @@ def test_large_file_detection():
     ]
     
     print("Testing large file detection:")
-    all_passed = True
     
-    for file_size_mb, threshold_mb, expected_large in test_cases:
-        file_size_bytes = file_size_mb * 1024 * 1024
-        threshold_bytes = threshold_mb * 1024 * 1024
-        
-        is_large = file_size_bytes > threshold_bytes
-        status = "✓" if is_large == expected_large else "✗"
-        
-        print(f"  {status} {file_size_mb}MB file with {threshold_mb}MB threshold -> {'LARGE' if is_large else 'NORMAL'}")
-        
-        if is_large != expected_large:
-            all_passed = False
+    # Classify every case in one pass, then compare against the expected mask
+    is_large_mask = [
+        file_size_mb * 1024 * 1024 > threshold_mb * 1024 * 1024
+        for file_size_mb, threshold_mb, _ in test_cases
+    ]
+    expected_mask = [expected_large for _, _, expected_large in test_cases]
+    all_passed = is_large_mask == expected_mask
+    
+    _write_lines([
+        f"  {'✓' if is_large == expected_large else '✗'} {file_size_mb}MB file with {threshold_mb}MB threshold -> {'LARGE' if is_large else 'NORMAL'}"
+        for (file_size_mb, threshold_mb, expected_large), is_large in zip(test_cases, is_large_mask)
+    ])
     
     if all_passed:
         print("\n✅ TEST PASSED: Large file detection working correctly")
@@ -150,8 +181,6 @@ def test_message_id_generation():
     print("TEST 4: Message ID Generation")
     print("="*80)
     
-    import hashlib
-    
     # Test that different messages get different IDs
     messages = [
         ("file1.pst", "Subject 1", "sender1@example.com", "2024-01-01 10:00:00"),
@@ -159,21 +188,22 @@ def test_message_id_generation():
         ("file2.pst", "Subject 1", "sender1@example.com", "2024-01-01 10:00:00"),
     ]
     
-    message_ids = []
-    for source_file, subject, sender, delivery_time in messages:
-        message_id = hashlib.md5(f"{source_file}{subject}{sender}{delivery_time}".encode()).hexdigest()
-        message_ids.append(message_id)
-        print(f"  Message: {subject} -> ID: {message_id[:16]}...")
+    message_ids = _generate_message_ids(messages)
+    _write_lines([
+        f"  Message: {subject} -> ID: {message_id[:16]}..."
+        for (_, subject, _, _), message_id in zip(messages, message_ids)
+    ])
     
-    # Check all IDs are unique
-    unique_ids = len(set(message_ids))
+    # Check all IDs are unique, stopping at the first duplicate
+    seen_ids = set()
+    for message_id in message_ids:
+        if message_id in seen_ids:
+            print(f"\n❌ TEST FAILED: Duplicate message ID {message_id[:16]}... after {len(seen_ids)} unique IDs")
+            return False
+        seen_ids.add(message_id)
     
-    if unique_ids == len(messages):
-        print(f"\n✅ TEST PASSED: All {len(messages)} messages have unique IDs")
-        return True
-    else:
-        print(f"\n❌ TEST FAILED: Expected {len(messages)} unique IDs, got {unique_ids}")
-        return False
+    print(f"\n✅ TEST PASSED: All {len(messages)} messages have unique IDs")
+    return True
 
 
 def test_batch_processing():
@@ -186,10 +216,9 @@ def test_batch_processing():
     total_messages = 2547
     batch_size = 1000
     
-    batches = []
-    for i in range(0, total_messages, batch_size):
-        batch = list(range(i, min(i + batch_size, total_messages)))
-        batches.append(batch)
+    # Slicing a range yields lightweight range views instead of materialized lists
+    messages = range(total_messages)
+    batches = [messages[i:i + batch_size] for i in range(0, total_messages, batch_size)]
     
     print(f"Total messages: {total_messages}")
     print(f"Batch size: {batch_size}")
@@ -199,8 +228,7 @@ def test_batch_processing():
     total_in_batches = sum(len(b) for b in batches)
     
     print(f"\nBatch breakdown:")
-    for i, batch in enumerate(batches):
-        print(f"  Batch {i+1}: {len(batch)} messages")
+    _write_lines([f"  Batch {i+1}: {len(batch)} messages" for i, batch in enumerate(batches)])
     
     if total_in_batches == total_messages:
         print(f"\n✅ TEST PASSED: All {total_messages} messages batched correctly")